@@ -3,116 +3,258 @@ Sales Data Visualization Tutorial
 Reads CSV data and displays it in a bar chart using flet-charts
 """
 
+import csv
+import json
+import mmap
+import os
+from functools import partial
+from typing import NamedTuple
+
 import flet as ft
 from flet_charts import BarChart, BarChartGroup, BarChartRod, ChartAxis, ChartAxisLabel
 
+# Colors used by both the chart and the page, looked up once
+_BLUE400 = ft.Colors.BLUE_400
+_RED400 = ft.Colors.RED_400
+_BLUE700 = ft.Colors.BLUE_700
+_RED700 = ft.Colors.RED_700
+_GREEN700 = ft.Colors.GREEN_700
+_GREY300 = ft.Colors.GREY_300
 
-def read_csv(filename: str) -> list[dict]:
-    """
-    Read a CSV file and return a list of dictionaries.
 
-    Each dictionary contains:
-    - "month": month name
-    - "sales": sales amount (int)
-    - "expenses": expenses amount (int)
-    """
-    data = []
+class Row(NamedTuple):
+    """One month of data from the CSV file."""
 
-    try:
-        with open(filename, "r") as file:
-            lines = file.readlines()
+    month: str
+    sales: int
+    expenses: int
 
-        # Skip the header line (first line)
-        for line in lines[1:]:
-            # Remove newline and any extra whitespace
-            line = line.strip()
 
-            # Skip empty lines
-            if not line:
-                continue
-
-            # Split by comma and use tuple unpacking
-            month, sales_str, expenses_str = line.split(",")
+def read_csv(filename: str) -> list[Row]:
+    """
+    Read a CSV file and return a list of Row tuples.
 
-            # Extract and convert values
-            month = month.strip()
-            sales = int(sales_str.strip())
-            expenses = int(expenses_str.strip())
+    Each Row contains:
+    - month: month name
+    - sales: sales amount (int)
+    - expenses: expenses amount (int)
 
-            # Store in dictionary
-            data.append({"month": month, "sales": sales, "expenses": expenses})
+    The parsed rows are saved next to the CSV file (filename + ".cache.json"),
+    so later runs can skip parsing until the CSV file's modification
+    time or size changes.
+    """
+    cache_filename = filename + ".cache.json"
+    data = _read_cache(filename, cache_filename)
+    if data is not None:
+        return data
 
+    try:
+        with open(filename, "rb") as file:
+            source_stat = os.fstat(file.fileno())
+            # mmap can't map an empty file, and an empty file has no rows
+            if source_stat.st_size == 0:
+                data, skipped = [], 0
+            else:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    data, skipped = _parse_rows(buffer)
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found!")
         return []
-    except ValueError as e:
-        print(f"Error: Could not parse data - {e}")
-        return []
-    except Exception as e:
-        print(f"Error: {e}")
+    except OSError as e:
+        print(f"Error: Could not read '{filename}' - {e}")
         return []
 
+    if skipped:
+        # Don't cache a partial parse: the warning should show on every run
+        # until the file is fixed
+        print(f"Warning: Skipped {skipped} line(s) that could not be parsed")
+    else:
+        _write_cache(cache_filename, source_stat, data)
+
     return data
 
 
-def create_sales_chart(data: list[dict]) -> BarChart:
+def _parse_rows(buffer: mmap.mmap) -> tuple[list[Row], int]:
+    """
+    Parse the data lines of a memory-mapped CSV file.
+
+    Field boundaries are found with find() on the mapped bytes, so the
+    only objects created per line are the month string, the two ints
+    and the Row itself. Lines containing a quote are handed to the csv
+    module instead. Malformed lines are skipped and counted.
+
+    Returns (rows, number of skipped lines).
+    """
+    data = []
+    skipped = 0
+    end = len(buffer)
+
+    # Skip the header line (first line)
+    header_end = buffer.find(b"\n")
+    pos = end if header_end == -1 else header_end + 1
+
+    while pos < end:
+        line_end = buffer.find(b"\n", pos)
+        if line_end == -1:
+            line_end = end
+
+        # Quoted fields (which may hold commas) are left to the csv module
+        if buffer.find(b'"', pos, line_end) != -1:
+            try:
+                data.append(_parse_quoted_line(buffer[pos:line_end]))
+            except (ValueError, csv.Error):
+                skipped += 1
+            pos = line_end + 1
+            continue
+
+        first_comma = buffer.find(b",", pos, line_end)
+        second_comma = -1
+        if first_comma != -1:
+            second_comma = buffer.find(b",", first_comma + 1, line_end)
+
+        if second_comma != -1:
+            try:
+                # int() accepts bytes and ignores surrounding whitespace
+                # (including a trailing "\r"), so only the month needs stripping
+                month = buffer[pos:first_comma].decode().strip()
+                sales = int(buffer[first_comma + 1 : second_comma])
+                expenses = int(buffer[second_comma + 1 : line_end])
+            except ValueError:
+                skipped += 1
+            else:
+                data.append(Row(month, sales, expenses))
+        elif buffer[pos:line_end].strip():
+            # Anything other than an empty line needs all three fields
+            skipped += 1
+
+        pos = line_end + 1
+
+    return data, skipped
+
+
+def _parse_quoted_line(line: bytes) -> Row:
+    """Parse one line that contains quotes with csv.reader."""
+    # skipinitialspace drops spaces after each comma while parsing
+    (fields,) = csv.reader([line.decode()], skipinitialspace=True)
+
+    # Use tuple unpacking to name the three fields
+    month, sales_str, expenses_str = fields
+
+    return Row(month.strip(), int(sales_str), int(expenses_str))
+
+
+def _read_cache(filename: str, cache_filename: str) -> list[Row] | None:
+    """Return the cached rows, or None if the cache is missing or stale."""
+    # The cache is only a shortcut: anything wrong with it (missing, stale,
+    # corrupted or in an old format) just means the CSV is parsed again
+    try:
+        source_stat = os.stat(filename)
+        with open(cache_filename, "r", encoding="utf-8") as file:
+            mtime_ns, size, rows = json.load(file)
+
+        # Any change to the CSV's modification time or size means it was
+        # edited or replaced since the cache was written, even by an older copy
+        if (mtime_ns, size) != (source_stat.st_mtime_ns, source_stat.st_size):
+            return None
+
+        return [
+            Row(str(month), int(sales), int(expenses))
+            for month, sales, expenses in rows
+        ]
+    except Exception:
+        return None
+
+
+def _write_cache(
+    cache_filename: str, source_stat: os.stat_result, data: list[Row]
+) -> None:
+    """Save the parsed rows; a cache that can't be written is just skipped."""
+    # Rows are plain (str, int, int) tuples, so JSON can store them and
+    # loading the cache never runs code the way unpickling can
+    try:
+        with open(cache_filename, "w", encoding="utf-8") as file:
+            json.dump([source_stat.st_mtime_ns, source_stat.st_size, data], file)
+    except OSError:
+        pass
+
+
+def split_columns(data: list[Row]) -> tuple[list[str], list[int], list[int]]:
+    """
+    Split the rows from read_csv() into three parallel lists (columns).
+
+    Returns (months, sales, expenses), so each column can be passed
+    straight to built-ins like sum() and max().
+    """
+    if not data:
+        return [], [], []
+
+    # zip(*data) turns the rows inside out: one tuple per column
+    months, sales, expenses = zip(*data)
+
+    return list(months), list(sales), list(expenses)
+
+
+def create_sales_chart(data: list[Row]) -> BarChart:
     """
     Create a bar chart from the sales data.
 
     Shows sales and expenses as side-by-side bars for each month.
     """
-    groups = []
-    bottom_labels = []
+    # Nothing to plot: skip the axis math and return an empty chart
+    if not data:
+        return BarChart(groups=[], width=900, height=450)
+
+    months, sales, expenses = split_columns(data)
+
+    # Bind BarChartGroup to a local once, outside the per-month comprehension
+    make_group = BarChartGroup
+    # Fix the arguments every bar shares so each rod only needs its own values
+    sales_rod = partial(BarChartRod, from_y=0, color=_BLUE400, width=25)
+    expenses_rod = partial(BarChartRod, from_y=0, color=_RED400, width=25)
 
     # Find max value to determine y-axis range
-    max_value = max(max(item["sales"], item["expenses"]) for item in data)
+    max_value = max(max(sales), max(expenses))
     # Round up to nearest 1000 for clean axis labels
     max_y = ((max_value // 1000) + 1) * 1000
 
-    for index, item in enumerate(data):
-        # Use first 3 letters of month name for x-axis label
-        month_short = item["month"][:3]
-
-        # Create a group with two bars: sales and expenses
-        # x must be an integer index
-        group = BarChartGroup(
-            x=index,
+    # Build the x-axis labels and tooltip text up front, one list each
+    # Use first 3 letters of month name for x-axis label
+    months_short = [month[:3] for month in months]
+    sales_tips = [f"Sales: ${value:,}" for value in sales]
+    expenses_tips = [f"Expenses: ${value:,}" for value in expenses]
+
+    # Create a group with two bars for each month: sales and expenses
+    # x must be an integer index
+    bars = zip(sales, expenses, sales_tips, expenses_tips)
+    groups = [
+        make_group(
+            x=x,
             rods=[
                 # Sales bar (blue)
-                BarChartRod(
-                    from_y=0,
-                    to_y=item["sales"],
-                    color=ft.Colors.BLUE_400,
-                    width=25,
-                    tooltip=f"Sales: ${item['sales']:,}",
-                ),
+                sales_rod(to_y=sales_value, tooltip=sales_tip),
                 # Expenses bar (red)
-                BarChartRod(
-                    from_y=0,
-                    to_y=item["expenses"],
-                    color=ft.Colors.RED_400,
-                    width=25,
-                    tooltip=f"Expenses: ${item['expenses']:,}",
-                ),
+                expenses_rod(to_y=expenses_value, tooltip=expenses_tip),
             ],
             spacing=4,  # Space between rods in the group
         )
-        groups.append(group)
+        for x, (sales_value, expenses_value, sales_tip, expenses_tip) in enumerate(bars)
+    ]
 
-        # Create custom label for x-axis
-        bottom_labels.append(ChartAxisLabel(value=index, label=month_short))
+    # Create custom labels for x-axis
+    bottom_labels = [
+        ChartAxisLabel(value=index, label=month_short)
+        for index, month_short in enumerate(months_short)
+    ]
 
     # Create custom labels for y-axis (left axis) with proper formatting
-    # Use ft.Text controls to ensure consistent formatting
-    left_labels = []
     # Create labels every 1000 (0, 1K, 2K, 3K, etc.)
-    for value in range(0, max_y + 1000, 1000):
-        if value == 0:
-            label_text = "0"
-        else:
-            label_text = f"{value // 1000}K"
-        # Use ft.Text to ensure consistent horizontal rendering
-        left_labels.append(ChartAxisLabel(value=value, label=ft.Text(label_text)))
+    tick_count = max_y // 1000
+    label_texts = ["0"] + [f"{i}K" for i in range(1, tick_count + 1)]
+    # Use ft.Text to ensure consistent horizontal rendering
+    left_labels = [
+        ChartAxisLabel(value=i * 1000, label=ft.Text(label_text))
+        for i, label_text in enumerate(label_texts)
+    ]
 
     # Create the chart with all groups
     chart = BarChart(
@@ -132,10 +274,16 @@ def create_sales_chart(data: list[dict]) -> BarChart:
     return chart
 
 
-def calculate_totals(data: list[dict]) -> dict:
+def calculate_totals(data: list[Row]) -> dict:
     """Calculate total sales and expenses."""
-    total_sales = sum(item["sales"] for item in data)
-    total_expenses = sum(item["expenses"] for item in data)
+    if not data:
+        return {"sales": 0, "expenses": 0, "profit": 0}
+
+    # zip(*data) gives one tuple per column; sum() reads them as they are,
+    # without copying them into lists or building an unused months column
+    _, sales, expenses = zip(*data)
+    total_sales = sum(sales)
+    total_expenses = sum(expenses)
     total_profit = total_sales - total_expenses
 
     return {"sales": total_sales, "expenses": total_expenses, "profit": total_profit}
@@ -174,7 +322,7 @@ def main(page: ft.Page):
             "Monthly Sales and Expenses",
             size=28,
             weight=ft.FontWeight.BOLD,
-            color=ft.Colors.BLUE_700,
+            color=_BLUE700,
         ),
         # Summary statistics
         ft.Container(
@@ -184,19 +332,19 @@ def main(page: ft.Page):
                         f"Total Sales: ${totals['sales']:,}",
                         size=16,
                         weight=ft.FontWeight.W_500,
-                        color=ft.Colors.BLUE_700,
+                        color=_BLUE700,
                     ),
                     ft.Text(
                         f"Total Expenses: ${totals['expenses']:,}",
                         size=16,
                         weight=ft.FontWeight.W_500,
-                        color=ft.Colors.RED_700,
+                        color=_RED700,
                     ),
                     ft.Text(
                         f"Total Profit: ${totals['profit']:,}",
                         size=16,
                         weight=ft.FontWeight.W_500,
-                        color=ft.Colors.GREEN_700,
+                        color=_GREEN700,
                     ),
                 ],
                 spacing=30,
@@ -207,20 +355,16 @@ def main(page: ft.Page):
         ft.Container(
             content=chart,
             padding=20,
-            border=ft.Border.all(1, ft.Colors.GREY_300),
+            border=ft.Border.all(1, _GREY300),
             border_radius=10,
         ),
         # Legend
         ft.Row(
             [
-                ft.Container(
-                    width=20, height=20, bgcolor=ft.Colors.BLUE_400, border_radius=4
-                ),
+                ft.Container(width=20, height=20, bgcolor=_BLUE400, border_radius=4),
                 ft.Text("Sales", size=14),
                 ft.Container(width=30),  # Spacing
-                ft.Container(
-                    width=20, height=20, bgcolor=ft.Colors.RED_400, border_radius=4
-                ),
+                ft.Container(width=20, height=20, bgcolor=_RED400, border_radius=4),
                 ft.Text("Expenses", size=14),
             ],
             alignment=ft.MainAxisAlignment.CENTER,
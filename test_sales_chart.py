@@ -1,123 +1,182 @@
 """
 Test file for sales_chart_app.py
-Demonstrates using assert statements to test pure functions
+Demonstrates using assert statements to test pure functions, plus
+read_csv() tests that use pytest's tmp_path for real files
 """
 
-from sales_chart_app import calculate_totals, read_csv
+import os
+
+import pytest
+
+from sales_chart_app import Row, calculate_totals, create_sales_chart, read_csv
+
+HEADER = "Month,Sales,Expenses\n"
+
+
+@pytest.mark.parametrize(
+    "test_data, expected",
+    [
+        pytest.param(
+            [Row("January", 1000, 500), Row("February", 2000, 800)],
+            {"sales": 3000, "expenses": 1300, "profit": 1700},
+            id="basic",
+        ),
+        pytest.param(
+            [],
+            {"sales": 0, "expenses": 0, "profit": 0},
+            id="empty",
+        ),
+        pytest.param(
+            [Row("January", 5000, 3000)],
+            {"sales": 5000, "expenses": 3000, "profit": 2000},
+            id="single_item",
+        ),
+        pytest.param(
+            [Row("January", 100000, 50000), Row("February", 200000, 75000)],
+            {"sales": 300000, "expenses": 125000, "profit": 175000},
+            id="large_numbers",
+        ),
+        pytest.param(
+            # Expenses exceed sales, so profit should be negative
+            [Row("January", 1000, 2000)],
+            {"sales": 1000, "expenses": 2000, "profit": -1000},
+            id="loss_scenario",
+        ),
+        pytest.param(
+            [Row("January", 0, 0)],
+            {"sales": 0, "expenses": 0, "profit": 0},
+            id="zero_values",
+        ),
+    ],
+)
+def test_calculate_totals(test_data, expected):
+    """Test calculate_totals against known totals for each data set."""
+    assert calculate_totals(test_data) == expected
+
+
+def write_csv(tmp_path, text, newline=None):
+    """Write text to data.csv in tmp_path and return the file name."""
+    path = tmp_path / "data.csv"
+    path.write_text(text, newline=newline)
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "text, newline",
+    [
+        pytest.param(HEADER + "January,4500,3200\nFebruary,5200,3400\n", None, id="lf"),
+        pytest.param(
+            HEADER + "January,4500,3200\nFebruary,5200,3400\n", "\r\n", id="crlf"
+        ),
+        pytest.param(
+            HEADER + "January,4500,3200\nFebruary,5200,3400",
+            None,
+            id="no_final_newline",
+        ),
+        pytest.param(
+            HEADER + '"January", 4500, 3200\n\nFebruary ,5200,3400\n',
+            None,
+            id="quotes_spaces_and_blank_line",
+        ),
+        pytest.param(
+            HEADER + '"January","4500", 3200\r\n"February", 5200,"3400"\r\n',
+            "",
+            id="quoted_numbers",
+        ),
+    ],
+)
+def test_read_csv_rows(tmp_path, text, newline):
+    """Test read_csv on well-formed files with different line endings."""
+    filename = write_csv(tmp_path, text, newline)
+
+    assert read_csv(filename) == [
+        Row("January", 4500, 3200),
+        Row("February", 5200, 3400),
+    ]
 
 
-def test_calculate_totals_basic():
-    """Test calculate_totals with basic data."""
-    test_data = [
-        {"month": "January", "sales": 1000, "expenses": 500},
-        {"month": "February", "sales": 2000, "expenses": 800}
-    ]
-    
-    result = calculate_totals(test_data)
-    
-    # Test that calculations are correct
-    assert result["sales"] == 3000, "Total sales should be 3000"
-    assert result["expenses"] == 1300, "Total expenses should be 1300"
-    assert result["profit"] == 1700, "Total profit should be 1700"
-    
-    print("✓ Basic totals test passed!")
-
-
-def test_calculate_totals_empty():
-    """Test calculate_totals with empty data."""
-    result = calculate_totals([])
-    
-    assert result["sales"] == 0, "Empty list should return 0 sales"
-    assert result["expenses"] == 0, "Empty list should return 0 expenses"
-    assert result["profit"] == 0, "Empty list should return 0 profit"
-    
-    print("✓ Empty data test passed!")
-
-
-def test_calculate_totals_single_item():
-    """Test calculate_totals with a single item."""
-    test_data = [
-        {"month": "January", "sales": 5000, "expenses": 3000}
-    ]
-    
-    result = calculate_totals(test_data)
-    
-    assert result["sales"] == 5000, "Single item sales should be 5000"
-    assert result["expenses"] == 3000, "Single item expenses should be 3000"
-    assert result["profit"] == 2000, "Single item profit should be 2000"
-    
-    print("✓ Single item test passed!")
-
-
-def test_calculate_totals_large_numbers():
-    """Test calculate_totals with large numbers."""
-    test_data = [
-        {"month": "January", "sales": 100000, "expenses": 50000},
-        {"month": "February", "sales": 200000, "expenses": 75000}
-    ]
-    
-    result = calculate_totals(test_data)
-    
-    assert result["sales"] == 300000, "Large numbers should calculate correctly"
-    assert result["expenses"] == 125000, "Large expenses should calculate correctly"
-    assert result["profit"] == 175000, "Large profit should calculate correctly"
-    
-    print("✓ Large numbers test passed!")
-
-
-def test_calculate_totals_loss_scenario():
-    """Test calculate_totals when expenses exceed sales (loss)."""
-    test_data = [
-        {"month": "January", "sales": 1000, "expenses": 2000}
-    ]
-    
-    result = calculate_totals(test_data)
-    
-    assert result["sales"] == 1000
-    assert result["expenses"] == 2000
-    assert result["profit"] == -1000, "Profit should be negative when expenses > sales"
-    
-    print("✓ Loss scenario test passed!")
-
-
-def test_calculate_totals_zero_values():
-    """Test calculate_totals with zero values."""
-    test_data = [
-        {"month": "January", "sales": 0, "expenses": 0}
-    ]
-    
-    result = calculate_totals(test_data)
-    
-    assert result["sales"] == 0
-    assert result["expenses"] == 0
-    assert result["profit"] == 0
-    
-    print("✓ Zero values test passed!")
-
-
-def run_all_tests():
-    """Run all test functions."""
-    print("Running tests for calculate_totals()...\n")
-    
-    try:
-        test_calculate_totals_basic()
-        test_calculate_totals_empty()
-        test_calculate_totals_single_item()
-        test_calculate_totals_large_numbers()
-        test_calculate_totals_loss_scenario()
-        test_calculate_totals_zero_values()
-        
-        print("\n" + "="*50)
-        print("All tests passed! ✓")
-        print("="*50)
-        
-    except AssertionError as e:
-        print(f"\n❌ Test failed: {e}")
-        raise
-    except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
-        raise
+def test_read_csv_quoted_comma(tmp_path):
+    """Test that a quoted month may contain a comma."""
+    filename = write_csv(tmp_path, HEADER + '"January, 2025",4500,3200\n')
+
+    assert read_csv(filename) == [Row("January, 2025", 4500, 3200)]
+
+
+@pytest.mark.parametrize("text", ["", HEADER], ids=["empty", "header_only"])
+def test_read_csv_no_rows(tmp_path, text):
+    """Test read_csv on files without any data lines."""
+    assert read_csv(write_csv(tmp_path, text)) == []
+
+
+def test_read_csv_missing_file(tmp_path):
+    """Test read_csv when the file doesn't exist."""
+    assert read_csv(str(tmp_path / "missing.csv")) == []
+
+
+def test_read_csv_skips_malformed_lines(tmp_path, capsys):
+    """Test that bad lines are skipped, good lines kept, and nothing cached."""
+    filename = write_csv(
+        tmp_path, HEADER + "January,4500,3200\nFebruary,x,3400\nMarch,4800\n"
+    )
+
+    assert read_csv(filename) == [Row("January", 4500, 3200)]
+    assert "Skipped 2 line(s)" in capsys.readouterr().out
+    assert not os.path.exists(filename + ".cache.json")
+
+
+def test_read_csv_reuses_cache(tmp_path):
+    """Test that an unchanged CSV (same mtime and size) is read from the cache."""
+    filename = write_csv(tmp_path, HEADER + "January,4500,3200\n")
+    assert read_csv(filename) == [Row("January", 4500, 3200)]
+    assert os.path.exists(filename + ".cache.json")
+
+    # Same size and modification time, so the cached rows are returned
+    stat = os.stat(filename)
+    write_csv(tmp_path, HEADER + "January,9999,9999\n")
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert read_csv(filename) == [Row("January", 4500, 3200)]
+
+
+@pytest.mark.parametrize("mtime_shift", [1, -1], ids=["newer", "older_copy"])
+def test_read_csv_ignores_stale_cache(tmp_path, mtime_shift):
+    """Test that the cache is ignored once the CSV has been changed or replaced."""
+    filename = write_csv(tmp_path, HEADER + "January,4500,3200\n")
+    assert read_csv(filename) == [Row("January", 4500, 3200)]
+
+    stat = os.stat(filename)
+    write_csv(tmp_path, HEADER + "January,9999,9999\n")
+    mtime_ns = stat.st_mtime_ns + mtime_shift * 1_000_000_000
+    os.utime(filename, ns=(stat.st_atime_ns, mtime_ns))
+
+    assert read_csv(filename) == [Row("January", 9999, 9999)]
+
+
+@pytest.mark.parametrize(
+    "make_cache",
+    [
+        pytest.param(lambda stat: "not json at all", id="garbage"),
+        pytest.param(
+            lambda stat: f'[{stat.st_mtime_ns}, {stat.st_size}, [["January", 1]]]',
+            id="wrong_length_rows",
+        ),
+    ],
+)
+def test_read_csv_ignores_corrupted_cache(tmp_path, make_cache):
+    """Test that a corrupted cache file is ignored and the CSV parsed again."""
+    filename = write_csv(tmp_path, HEADER + "January,4500,3200\n")
+    with open(filename + ".cache.json", "w") as file:
+        file.write(make_cache(os.stat(filename)))
+
+    assert read_csv(filename) == [Row("January", 4500, 3200)]
+
+
+def test_create_sales_chart_empty():
+    """Test that create_sales_chart returns an empty chart for no data."""
+    chart = create_sales_chart([])
+
+    assert chart.groups == []
 
 
 if __name__ == "__main__":
-    run_all_tests()
+    raise SystemExit(pytest.main([__file__, "-v"]))